@@ -9,9 +9,8 @@ from dotenv import load_dotenv
 from endpoint_utils import get_inputs
 from llama_index.llms.types import ChatMessage, MessageRole
 from log_utils import init_pw_log_config
-from rag import DEFAULT_PATHWAY_HOST, PATHWAY_HOST, get_chat_engine, vector_client
+from rag import DEFAULT_PATHWAY_HOST, PATHWAY_HOST, get_chat_engine, get_vector_client, init_tracing
 from streamlit.web.server.websocket_headers import _get_websocket_headers
-from traceloop.sdk import Traceloop
 
 logging.basicConfig(
     level=logging.INFO,
@@ -112,7 +111,9 @@ if "messages" not in st.session_state.keys():
         session_id = "uuid-" + str(uuid.uuid4())
 
         logging.info(json.dumps({"_type": "set_session_id", "session_id": session_id}))
-        Traceloop.set_association_properties({"session_id": session_id})
+        tracer = init_tracing()
+        if tracer is not None:
+            tracer.set_association_properties({"session_id": session_id})
         st.session_state["session_id"] = session_id
 
     headers = _get_websocket_headers()
@@ -142,7 +143,7 @@ if "messages" not in st.session_state.keys():
         {"role": msg.role, "content": msg.content} for msg in chat_engine.chat_history
     ]
     st.session_state.chat_engine = chat_engine
-    st.session_state.vector_client = vector_client
+    st.session_state.vector_client = get_vector_client()
 
 
 results = get_inputs()
@@ -2,17 +2,74 @@
 
 "This file implements citation tracking and claim validation."
 
+import re
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
 class CitationTracker:
     def __init__(self):
         self.citations = []
+        self._automaton = ahocorasick.Automaton() if AHOCORASICK_AVAILABLE else None
+        self._hs_db = None
+        self._dirty = False
+        self._has_empty = False
 
     def add_citation(self, citation):
         self.citations.append(citation)
+        if not citation:
+            self._has_empty = True
+            return
+        if self._automaton is not None:
+            self._automaton.add_word(citation, citation)
+        self._dirty = True
 
     def validate_claim(self, claim):
         # Logic for validating a claim against citations
+        if self._has_empty:
+            # An empty citation is trivially contained in any claim
+            return True
+        if not self.citations:
+            return False
+        if self._automaton is not None:
+            if self._dirty:
+                # Rebuild the failure links only when citations were added since the last query
+                self._automaton.make_automaton()
+                self._dirty = False
+            return next(self._automaton.iter(claim), None) is not None
+        if HYPERSCAN_AVAILABLE:
+            return self._scan_hyperscan(claim)
         return any(citation in claim for citation in self.citations)
 
+    def _scan_hyperscan(self, claim):
+        # Compile all citations into one vectorized literal database, recompiled only when dirty
+        if self._dirty or self._hs_db is None:
+            self._hs_db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            self._hs_db.compile(
+                expressions=[re.escape(c).encode('utf-8') for c in self.citations],
+                ids=list(range(len(self.citations))),
+                elements=len(self.citations),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(self.citations),
+            )
+            self._dirty = False
+
+        matched = []
+
+        def on_match(pattern_id, start, end, flags, context):
+            matched.append(pattern_id)
+
+        self._hs_db.scan(claim.encode('utf-8'), match_event_handler=on_match)
+        return bool(matched)
+
 if __name__ == '__main__':
     tracker = CitationTracker()
     tracker.add_citation('Doe, J. (2020). Example citation.')
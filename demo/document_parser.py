@@ -3,36 +3,158 @@ Document parser module for handling multiple file formats.
 Supports PDF, DOCX (Word), and XLSX (Excel) files.
 """
 
+import datetime
 import io
 import logging
+import mmap
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, List, Tuple
 
-# PDF parsing
+# PDF parsing (PyMuPDF preferred, pypdf as fallback)
+try:
+    import fitz
+    FITZ_AVAILABLE = True
+except ImportError:
+    FITZ_AVAILABLE = False
+
 try:
     import pypdf
-    PDF_AVAILABLE = True
+    PYPDF_AVAILABLE = True
 except ImportError:
-    PDF_AVAILABLE = False
+    PYPDF_AVAILABLE = False
+
+PDF_AVAILABLE = FITZ_AVAILABLE or PYPDF_AVAILABLE
+if not PDF_AVAILABLE:
     logging.warning("pypdf not installed. PDF parsing will not be available.")
 
 # DOCX parsing
 try:
     from docx import Document as DocxDocument
+    from docx.oxml.ns import qn
     DOCX_AVAILABLE = True
 except ImportError:
     DOCX_AVAILABLE = False
     logging.warning("python-docx not installed. DOCX parsing will not be available.")
 
-# XLSX parsing
+# XLSX parsing (python-calamine preferred, openpyxl as fallback)
+try:
+    from python_calamine import CalamineWorkbook
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
 try:
     import openpyxl
-    XLSX_AVAILABLE = True
+    OPENPYXL_AVAILABLE = True
 except ImportError:
-    XLSX_AVAILABLE = False
+    OPENPYXL_AVAILABLE = False
+
+XLSX_AVAILABLE = CALAMINE_AVAILABLE or OPENPYXL_AVAILABLE
+if not XLSX_AVAILABLE:
     logging.warning("openpyxl not installed. XLSX parsing will not be available.")
 
+# Supported extensions, resolved once from the installed backends
+_SUPPORTED_FORMATS = tuple(
+    ext for ext, available in [
+        (".pdf", PDF_AVAILABLE),
+        (".docx", DOCX_AVAILABLE),
+        (".doc", DOCX_AVAILABLE),
+        (".xlsx", XLSX_AVAILABLE),
+    ] if available
+)
+_SUPPORTED_FORMATS_SET = frozenset(_SUPPORTED_FORMATS)
+
+# WordprocessingML tags used when walking the DOCX XML tree directly
+if DOCX_AVAILABLE:
+    _W_P = qn("w:p")
+    _W_TBL = qn("w:tbl")
+    _W_TR = qn("w:tr")
+    _W_TC = qn("w:tc")
+    _W_R = qn("w:r")
+    _W_T = qn("w:t")
+    _W_TAB = qn("w:tab")
+    _W_BR = qn("w:br")
+    _W_CR = qn("w:cr")
+    _W_HYPERLINK = qn("w:hyperlink")
+
+
+def _docx_paragraph_text(paragraph) -> str:
+    """Text of a <w:p> element, reading the underlying XML instead of python-docx wrappers."""
+    pieces = []
+    # Only the paragraph's own runs and hyperlink runs, as python-docx reads them. A subtree walk would
+    # also pick up text boxes (twice, via mc:Choice and mc:Fallback) and <w:tab> tab-stop definitions
+    for child in paragraph.iterchildren(_W_R, _W_HYPERLINK):
+        runs = child.iterchildren(_W_R) if child.tag == _W_HYPERLINK else (child,)
+        for el in (el for run in runs for el in run):
+            if el.tag == _W_T:
+                pieces.append(el.text or "")
+            elif el.tag == _W_TAB:
+                pieces.append("\t")
+            elif el.tag == _W_BR or el.tag == _W_CR:
+                pieces.append("\n")
+    return "".join(pieces)
+
+# Page-level parallelism for long PDFs
+PDF_PAGE_WORKERS = min(4, os.cpu_count() or 1)
+PDF_PARALLEL_MIN_PAGES = 16
+
+
+def _pdf_page_ranges(page_count: int) -> List[Tuple[int, int]]:
+    """Split page indices into contiguous (start, stop) shards, or [] to parse serially."""
+    # Nested workers (e.g. batch_extract_text's process pool) parse serially: the outer pool already fills the cores
+    if (PDF_PAGE_WORKERS < 2 or page_count < PDF_PARALLEL_MIN_PAGES
+            or multiprocessing.parent_process() is not None):
+        return []
+    step = -(-page_count // PDF_PAGE_WORKERS)
+    return [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+
+def _cell_text(cell) -> str:
+    return "" if cell is None else str(cell)
+
+
+def _calamine_cell(cell):
+    """Normalize a calamine cell value to what openpyxl returns for the same cell."""
+    # calamine reads every number as float and date-only cells as date; openpyxl gives int and datetime
+    if type(cell) is float and cell.is_integer():
+        return int(cell)
+    if type(cell) is datetime.date:
+        return datetime.datetime.combine(cell, datetime.time())
+    return cell
+
+
+def _xlsx_row_text(row) -> str:
+    """Join a row of cell values with ' | ', rendering empty cells as ''."""
+    # Text-only rows (common for dashboards) skip the per-cell conversion entirely
+    if all(type(cell) is str for cell in row):
+        return " | ".join(row)
+    return " | ".join(map(_cell_text, row))
+
+
+@contextmanager
+def _mapped_pdf(file_path: str):
+    """Memory-map a PDF read-only so pypdf seeks through the page cache instead of buffered reads."""
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _fitz_extract_pages(file_path: str, start: int, stop: int) -> List[str]:
+    # Runs in a worker process; fitz documents are not picklable, so each shard opens its own
+    with fitz.open(file_path) as doc:
+        return [doc[i].get_text("text") for i in range(start, stop)]
+
+
+def _pypdf_extract_pages(file_path: str, start: int, stop: int) -> List[str]:
+    # pypdf readers are not picklable, so each worker process re-opens the file
+    with _mapped_pdf(file_path) as stream:
+        pdf_reader = pypdf.PdfReader(stream)
+        return [pdf_reader.pages[i].extract_text() for i in range(start, stop)]
+
 
 class DocumentParser:
     """Universal document parser supporting PDF, DOCX, and XLSX formats."""
@@ -52,12 +174,27 @@ class DocumentParser:
             return "", False
             
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = pypdf.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-            return text, True
+            if FITZ_AVAILABLE:
+                with fitz.open(file_path) as doc:
+                    ranges = _pdf_page_ranges(len(doc))
+                    if not ranges:
+                        parts = [page.get_text("text") for page in doc]
+                        return "".join(parts), True
+                extract_pages = _fitz_extract_pages
+            else:
+                with _mapped_pdf(file_path) as stream:
+                    pdf_reader = pypdf.PdfReader(stream)
+                    ranges = _pdf_page_ranges(len(pdf_reader.pages))
+                    if not ranges:
+                        parts = [page.extract_text() for page in pdf_reader.pages]
+                        return "".join(parts), True
+                extract_pages = _pypdf_extract_pages
+            
+            # Processes, not threads: PyMuPDF holds the GIL and pypdf is pure Python
+            with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                starts, stops = zip(*ranges)
+                shards = list(executor.map(extract_pages, [file_path] * len(ranges), starts, stops))
+            return "".join(text for shard in shards for text in shard), True
         except Exception as e:
             logging.error(f"Error parsing PDF {file_path}: {str(e)}")
             return "", False
@@ -78,19 +215,22 @@ class DocumentParser:
             
         try:
             doc = DocxDocument(file_path)
-            text = ""
+            parts = []
             
-            # Extract paragraphs
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
+            # Extract top-level paragraphs straight from the XML body
+            for paragraph in doc.element.body.iterchildren(_W_P):
+                parts.append(_docx_paragraph_text(paragraph) + "\n")
             
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = " | ".join(cell.text for cell in row.cells)
-                    text += row_text + "\n"
+            # Extract text from top-level tables in one pass over their rows' XML
+            for table in doc.element.body.iterchildren(_W_TBL):
+                for row in table.iterchildren(_W_TR):
+                    cells = [
+                        "\n".join(_docx_paragraph_text(p) for p in cell.iterchildren(_W_P))
+                        for cell in row.iterchildren(_W_TC)
+                    ]
+                    parts.append(" | ".join(cells) + "\n")
             
-            return text, True
+            return "".join(parts), True
         except Exception as e:
             logging.error(f"Error parsing DOCX {file_path}: {str(e)}")
             return "", False
@@ -110,18 +250,37 @@ class DocumentParser:
             return "", False
             
         try:
-            workbook = openpyxl.load_workbook(file_path)
-            text = ""
-            
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                text += f"\n=== Sheet: {sheet_name} ===\n"
+            if CALAMINE_AVAILABLE:
+                workbook = CalamineWorkbook.from_path(file_path)
+                parts = []
+                
+                for sheet_name in workbook.sheet_names:
+                    sheet = workbook.get_sheet_by_name(sheet_name)
+                    parts.append(f"\n=== Sheet: {sheet_name} ===\n")
+                    
+                    # Keep leading empty rows/columns so the layout matches openpyxl
+                    for row in sheet.to_python(skip_empty_area=False):
+                        parts.append(_xlsx_row_text([_calamine_cell(cell) for cell in row]) + "\n")
                 
-                for row in sheet.iter_rows(values_only=True):
-                    row_text = " | ".join(str(cell) if cell is not None else "" for cell in row)
-                    text += row_text + "\n"
+                return "".join(parts), True
+            
+            # Read-only mode streams rows instead of loading the whole workbook;
+            # data_only returns cached cell values rather than formulas
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            parts = []
+            
+            try:
+                for sheet_name in workbook.sheetnames:
+                    sheet = workbook[sheet_name]
+                    parts.append(f"\n=== Sheet: {sheet_name} ===\n")
+                    
+                    for row in sheet.iter_rows(values_only=True):
+                        parts.append(_xlsx_row_text(row) + "\n")
+            finally:
+                # Read-only workbooks keep the file handle open until closed
+                workbook.close()
             
-            return text, True
+            return "".join(parts), True
         except Exception as e:
             logging.error(f"Error parsing XLSX {file_path}: {str(e)}")
             return "", False
@@ -140,19 +299,12 @@ class DocumentParser:
         file_path = str(file_path)
         file_extension = Path(file_path).suffix.lower()
         
-        if file_extension == ".pdf":
-            return DocumentParser.parse_pdf(file_path)
-        elif file_extension == ".docx":
-            return DocumentParser.parse_docx(file_path)
-        elif file_extension in [".doc"]:
-            # For .doc files, we would need python-docx2docx or similar
-            # For now, we'll try to treat as DOCX if possible
-            return DocumentParser.parse_docx(file_path)
-        elif file_extension == ".xlsx":
-            return DocumentParser.parse_xlsx(file_path)
-        else:
+        # Single dict lookup in the factory's extension -> parser table
+        parser = DocumentParserFactory.get_parser(file_extension)
+        if parser is None:
             logging.warning(f"Unsupported file format: {file_extension}")
             return "", False
+        return parser(file_path)
 
     @staticmethod
     def get_supported_formats() -> List[str]:
@@ -162,14 +314,7 @@ class DocumentParser:
         Returns:
             List of supported file extensions
         """
-        formats = []
-        if PDF_AVAILABLE:
-            formats.append(".pdf")
-        if DOCX_AVAILABLE:
-            formats.extend([".docx", ".doc"])
-        if XLSX_AVAILABLE:
-            formats.append(".xlsx")
-        return formats
+        return list(_SUPPORTED_FORMATS)
 
     @staticmethod
     def is_format_supported(file_extension: str) -> bool:
@@ -182,7 +327,7 @@ class DocumentParser:
         Returns:
             True if format is supported, False otherwise
         """
-        return file_extension.lower() in DocumentParser.get_supported_formats()
+        return file_extension.lower() in _SUPPORTED_FORMATS_SET
 
 
 class DocumentParserFactory:
@@ -191,7 +336,9 @@ class DocumentParserFactory:
     _parsers = {
         ".pdf": DocumentParser.parse_pdf,
         ".docx": DocumentParser.parse_docx,
-        ".doc": DocumentParser.parse_docx,  # Treat as DOCX
+        # For .doc files, we would need python-docx2docx or similar
+        # For now, we'll try to treat as DOCX if possible
+        ".doc": DocumentParser.parse_docx,
         ".xlsx": DocumentParser.parse_xlsx,
     }
     
@@ -5,15 +5,137 @@ Provides helper functions to process documents before indexing.
 
 import os
 import logging
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from document_parser import DocumentParser, DocumentParserFactory
 
+# Optional on-disk cache shared across processes (e.g. batch_extract_text workers)
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
 
 logger = logging.getLogger(__name__)
 
 
+def _private_cache_dir() -> Optional[str]:
+    """Per-user cache directory for parsed documents, created with mode 0700.
+    
+    Returns None if the directory cannot be created or is not private to the
+    current user, since cached entries are pickled and must not be writable
+    by anyone else.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "nlp-live-rag", "docparse")
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.stat(path)
+    except OSError as e:
+        logger.warning(f"Cannot create parse cache directory {path}: {str(e)}")
+        return None
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        logger.warning(f"Parse cache directory {path} is not private to this user; disk cache disabled")
+        return None
+    return path
+
+
+class _ParseCache:
+    """LRU cache of parsed document content keyed by (path, mtime, size, extension).
+    
+    Uses a private per-user diskcache directory when available, otherwise an
+    in-memory LRU bounded by the total size of the cached text.
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.memory_enabled = True
+        self._entries: "OrderedDict[tuple, Tuple[str, bool]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk = None
+        if DISKCACHE_AVAILABLE:
+            path = _private_cache_dir()
+            if path is not None:
+                try:
+                    self._disk = diskcache.Cache(path)
+                except Exception as e:
+                    logger.warning(f"Disk cache unavailable, using in-memory cache: {str(e)}")
+    
+    def get(self, key: tuple) -> Optional[Tuple[str, bool]]:
+        if self._disk is not None:
+            return self._disk.get(key)
+        if not self.memory_enabled:
+            return None
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: tuple, value: Tuple[str, bool]) -> None:
+        if self._disk is not None:
+            self._disk.set(key, value)
+            return
+        if not self.memory_enabled:
+            return
+        size = sys.getsizeof(value[0])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= sys.getsizeof(previous[0])
+            self._entries[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= sys.getsizeof(evicted[0])
+
+
+_parse_cache = _ParseCache()
+
+
+def _ext(file_path: str) -> str:
+    """Lowercased file extension (same result as Path(file_path).suffix.lower(), without building a Path)."""
+    return os.path.splitext(file_path)[1].lower()
+
+
+def _iter_supported_documents(directory: str) -> Iterator[Tuple[str, str]]:
+    """Recursively yield (file_path, extension) for supported documents using os.scandir."""
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from _iter_supported_documents(entry.path)
+                        continue
+                    ext = _ext(entry.name)
+                    if ext in DocumentProcessingUtil.SUPPORTED_EXTENSIONS and entry.is_file():
+                        yield entry.path, ext
+                except OSError:
+                    continue
+    except OSError as e:
+        logger.warning(f"Skipping unreadable directory {directory}: {str(e)}")
+
+
+def _init_extract_worker() -> None:
+    """Process-pool initializer: skip the in-memory cache, which dies with the worker."""
+    _parse_cache.memory_enabled = False
+
+
+def _extract_worker(file_path: str, ext: Optional[str] = None) -> Tuple[str, str, bool]:
+    """Process-pool entry point: extract text from a single document."""
+    text, success = DocumentProcessingUtil.extract_text_from_document(file_path, ext=ext)
+    return file_path, text, success
+
+
 class DocumentProcessingUtil:
     """Utility class for document processing and text extraction."""
     
@@ -35,8 +157,7 @@ class DocumentProcessingUtil:
         Returns:
             File type description or None if unsupported
         """
-        ext = Path(file_path).suffix.lower()
-        return DocumentProcessingUtil.SUPPORTED_EXTENSIONS.get(ext)
+        return DocumentProcessingUtil.SUPPORTED_EXTENSIONS.get(_ext(str(file_path)))
     
     @staticmethod
     def is_supported_document(file_path: str) -> bool:
@@ -49,56 +170,116 @@ class DocumentProcessingUtil:
         Returns:
             True if file is supported
         """
-        ext = Path(file_path).suffix.lower()
-        return ext in DocumentProcessingUtil.SUPPORTED_EXTENSIONS
+        return _ext(str(file_path)) in DocumentProcessingUtil.SUPPORTED_EXTENSIONS
     
     @staticmethod
-    def extract_text_from_document(file_path: str) -> Tuple[str, bool]:
+    def extract_text_from_document(file_path: str, ext: Optional[str] = None) -> Tuple[str, bool]:
         """
         Extract text from any supported document format.
         
         Args:
             file_path: Path to the document
+            ext: Lowercased file extension, if already known by the caller
             
         Returns:
             Tuple of (extracted_text, success)
         """
-        if not os.path.exists(file_path):
+        try:
+            st = os.stat(file_path)
+        except OSError:
             logger.error(f"File not found: {file_path}")
             return "", False
         
-        ext = Path(file_path).suffix.lower()
+        if ext is None:
+            ext = _ext(str(file_path))
         parser = DocumentParserFactory.get_parser(ext)
         
         if parser is None:
             logger.warning(f"No parser found for extension: {ext}")
             return "", False
         
-        logger.info(f"Extracting text from {file_path} ({DocumentProcessingUtil.get_file_type(file_path)})")
-        return parser(file_path)
+        # Any change to the file bumps mtime/size, so stale entries are never hit
+        cache_key = (os.path.realpath(file_path), st.st_mtime_ns, st.st_size, ext)
+        cached = _parse_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        logger.info(f"Extracting text from {file_path} ({DocumentProcessingUtil.SUPPORTED_EXTENSIONS.get(ext)})")
+        text, success = parser(file_path)
+        if success:
+            _parse_cache.set(cache_key, (text, success))
+        return text, success
     
     @staticmethod
-    def batch_extract_text(directory: str) -> Dict[str, Tuple[str, bool]]:
+    def batch_extract_text_iter(
+        directory: str,
+        max_workers: Optional[int] = None,
+        max_concurrent: int = 32,
+    ) -> Iterator[Tuple[str, str, bool]]:
         """
-        Extract text from all supported documents in a directory.
+        Lazily extract text from all supported documents in a directory.
+        
+        Documents are parsed in parallel across a process pool and yielded as
+        they complete, so callers can stream results (e.g. into an indexer)
+        without holding every document's text in memory. This is the
+        preferred API for large directories.
         
         Args:
             directory: Path to directory containing documents
+            max_workers: Number of worker processes (defaults to min(cpu_count, 8),
+                capped at max_concurrent)
+            max_concurrent: Maximum number of documents in flight at once
             
-        Returns:
-            Dictionary mapping file paths to (text, success) tuples
+        Yields:
+            (file_path, text, success) tuples in completion order
         """
-        results = {}
-        
         if not os.path.isdir(directory):
             logger.error(f"Directory not found: {directory}")
-            return results
+            return
+        
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, 8)
+        # No point starting more workers than documents allowed in flight
+        max_concurrent = max(1, max_concurrent)
+        max_workers = max(1, min(max_workers, max_concurrent))
         
-        for file_path in Path(directory).glob('**/*'):
-            if file_path.is_file() and DocumentProcessingUtil.is_supported_document(str(file_path)):
-                results[str(file_path)] = DocumentProcessingUtil.extract_text_from_document(str(file_path))
+        pending = set()
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_extract_worker) as executor:
+            try:
+                for file_path, ext in _iter_supported_documents(os.path.normpath(directory)):
+                    # Bound the in-flight window; submit more only as earlier documents finish
+                    if len(pending) >= max_concurrent:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                    pending.add(executor.submit(_extract_worker, file_path, ext))
+                
+                for future in as_completed(pending):
+                    yield future.result()
+            finally:
+                # Drop queued work if the caller stops iterating early
+                for future in pending:
+                    future.cancel()
+    
+    @staticmethod
+    def batch_extract_text(directory: str, max_workers: Optional[int] = None) -> Dict[str, Tuple[str, bool]]:
+        """
+        Extract text from all supported documents in a directory.
+        
+        Thin wrapper around batch_extract_text_iter that collects every result;
+        prefer the iterator for large directories.
         
-        return results
+        Args:
+            directory: Path to directory containing documents
+            max_workers: Number of worker processes (defaults to min(cpu_count, 8))
+            
+        Returns:
+            Dictionary mapping file paths to (text, success) tuples
+        """
+        return {
+            file_path: (text, success)
+            for file_path, text, success in DocumentProcessingUtil.batch_extract_text_iter(directory, max_workers)
+        }
     
     @staticmethod
     def get_document_summary(file_path: str, max_length: int = 500) -> str:
@@ -134,21 +315,23 @@ class DocumentIndexingHelper:
         """
         path_obj = Path(file_path)
         
+        # One stat() call provides size and timestamps together
+        try:
+            st = os.stat(file_path)
+        except OSError as e:
+            logger.error(f"Cannot stat {file_path}: {str(e)}")
+            raise
+        
         metadata = {
             'file_name': path_obj.name,
             'file_path': str(file_path),
             'file_type': DocumentProcessingUtil.get_file_type(file_path),
-            'file_size': os.path.getsize(file_path),
+            'file_size': st.st_size,
             'extension': path_obj.suffix.lower(),
+            'created_time': st.st_ctime,
+            'modified_time': st.st_mtime,
         }
         
-        # Add file timestamps if available
-        try:
-            metadata['created_time'] = os.path.getctime(file_path)
-            metadata['modified_time'] = os.path.getmtime(file_path)
-        except OSError:
-            pass
-        
         return metadata
     
     @staticmethod
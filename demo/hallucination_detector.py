@@ -1,18 +1,42 @@
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Example criterion for detecting hallucinations
+HALLUCINATION_INDICATORS = [
+    "claims to be",
+    "according to sources",
+    "experts say",
+    "research has shown"
+]
+
+# Single-pass matcher over all indicators, built once at import
+if AHOCORASICK_AVAILABLE:
+    _AC = ahocorasick.Automaton()
+    for _index, _indicator in enumerate(HALLUCINATION_INDICATORS):
+        _AC.add_word(_indicator, _index)
+    _AC.make_automaton()
+else:
+    _AC = None
+
 def detect_hallucinations(text):
     """
     Detects potential hallucinated content in a given text.
     A hallucination in this context refers to statements or information presented as fact but not based on reliable sources.
     """
-    # Example criterion for detecting hallucinations
-    hallucination_indicators = [
-        "claims to be", 
-        "according to sources", 
-        "experts say", 
-        "research has shown"
-    ]
+    lowered = text.lower()
+
+    if _AC is not None:
+        # Report the first indicator in list order, as the sequential scan did
+        first = min((index for _, index in _AC.iter(lowered)), default=None)
+        if first is not None:
+            return f"Potential hallucination detected: {HALLUCINATION_INDICATORS[first]} found in text."
+        return "No hallucinations detected."
 
-    for indicator in hallucination_indicators:
-        if indicator in text.lower():
+    for indicator in HALLUCINATION_INDICATORS:
+        if indicator in lowered:
             return f"Potential hallucination detected: {indicator} found in text."
     return "No hallucinations detected."
 
@@ -1,33 +1,47 @@
 import logging
 import re
 import numpy as np
-import nltk
-from sklearn.metrics.pairwise import cosine_similarity
+
+# Compiled once; \w is Unicode-aware, so curly quotes, dashes and ellipses split words like ASCII punctuation
+_WORD = re.compile(r'\w+')
+
+
+def _toks(text):
+    return _WORD.findall(text.lower())
 
 # Define a class for Hallucination Prevention
 class HallucinationPrevention:
-    def __init__(self):
-        logging.basicConfig(level=logging.INFO)
-        nltk.download('punkt')  # Download necessary NLTK resources
-
     def detect_hallucination(self, generated_text, reference_text):
         # Simple keyword matching for hallucination detection
-        keywords = set(re.findall(r'\b\w+\b', reference_text.lower()))
-        generated_words = set(re.findall(r'\b\w+\b', generated_text.lower()))
-        hallucinated_words = generated_words - keywords
-        if hallucinated_words:
-            logging.warning('Detected potential hallucinated words: {}'.format(hallucinated_words))
-            return True  # Hallucination detected
+        keywords = set(_toks(reference_text))
+        # Stop at the first word missing from the reference; one is enough to flag the text
+        for word in _toks(generated_text):
+            if word not in keywords:
+                logging.warning('Detected potential hallucinated word: %s', word)
+                return True  # Hallucination detected
         return False  # No hallucination
 
     def cosine_similarity_check(self, generated_embedding, reference_embedding):
         # Calculate cosine similarity to detect hallucination
-        similarity = cosine_similarity([generated_embedding], [reference_embedding])[0][0]
+        denom = (np.linalg.norm(generated_embedding) * np.linalg.norm(reference_embedding)) or 1.0
+        similarity = float(np.dot(generated_embedding, reference_embedding) / denom)
         if similarity < 0.7:  # Threshold
             logging.warning('Low similarity detected. Potential hallucination.')
             return True
         return False
 
+    def batch_cosine_similarity_check(self, generated_embeddings, reference_embeddings):
+        # Row-wise cosine similarity of N embedding pairs in one pass; returns a boolean mask of flagged rows
+        generated_embeddings = np.asarray(generated_embeddings, dtype=float)
+        reference_embeddings = np.asarray(reference_embeddings, dtype=float)
+        dots = np.einsum('ij,ij->i', generated_embeddings, reference_embeddings)
+        denom = np.linalg.norm(generated_embeddings, axis=1) * np.linalg.norm(reference_embeddings, axis=1)
+        similarities = np.divide(dots, denom, out=np.zeros_like(dots), where=denom != 0)
+        flagged = similarities < 0.7  # Threshold
+        if flagged.any():
+            logging.warning('Low similarity detected for {} of {} pairs. Potential hallucination.'.format(int(flagged.sum()), len(flagged)))
+        return flagged
+
     def layered_detection(self, generated_text, reference_text, generated_embedding, reference_embedding):
         if self.detect_hallucination(generated_text, reference_text):
             return True
@@ -50,6 +64,7 @@ class HallucinationPrevention:
 
 # Example usage
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
     hp = HallucinationPrevention()
     # Dummy data for demonstration
     generated = "The eagle flies over the rainbow"  # This should trigger prevention
@@ -1,11 +1,9 @@
 import os
+import threading
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from llama_index.llms.types import ChatMessage, MessageRole
-from llama_index.retrievers import PathwayRetriever
-from traceloop.sdk import Traceloop
-
-from pathway.xpacks.llm.vector_store import VectorStoreClient
 
 load_dotenv()
 
@@ -17,15 +15,16 @@ if not os.environ.get("GOOGLE_API_KEY"):
         "You can obtain one from: https://aistudio.google.com/app/apikey"
     )
 
-
-Traceloop.init(app_name=os.environ.get("APP_NAME", "PW - LlamaIndex (Streamlit)"))
-
 DEFAULT_PATHWAY_HOST = "demo-document-indexing.pathway.stream"
 
 PATHWAY_HOST = os.environ.get("PATHWAY_HOST", DEFAULT_PATHWAY_HOST)
 
 PATHWAY_PORT = int(os.environ.get("PATHWAY_PORT", "80"))
 
+# Repeated questions within the TTL are answered from memory instead of the vector store; 0 disables
+RETRIEVER_CACHE_SIZE = int(os.environ.get("RETRIEVER_CACHE_SIZE", "512"))
+RETRIEVER_CACHE_TTL = float(os.environ.get("RETRIEVER_CACHE_TTL", "300"))
+
 
 def get_additional_headers():
     headers = {}
@@ -35,17 +34,34 @@ def get_additional_headers():
     return headers
 
 
-vector_client = VectorStoreClient(
-    PATHWAY_HOST,
-    PATHWAY_PORT,
-    additional_headers=get_additional_headers(),
-)
+# Network clients and tracing are created on first use rather than at import, so importing
+# this module (e.g. in a forked worker) opens no connections
+@lru_cache(maxsize=1)
+def init_tracing():
+    """Initialize Traceloop once per process and return it, or None if TRACELOOP_ENABLED=false.
+
+    When disabled the SDK is never imported; callers go through the returned object.
+    """
+    if os.environ.get("TRACELOOP_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    from traceloop.sdk import Traceloop
 
+    Traceloop.init(app_name=os.environ.get("APP_NAME", "PW - LlamaIndex (Streamlit)"))
+    return Traceloop
+
+
+@lru_cache(maxsize=1)
+def get_vector_client():
+    """Get the shared Pathway vector store client, creating it on first call."""
+    # pathway is the heaviest import here, so it is deferred until a client is needed
+    from pathway.xpacks.llm.vector_store import VectorStoreClient
+
+    return VectorStoreClient(
+        PATHWAY_HOST,
+        PATHWAY_PORT,
+        additional_headers=get_additional_headers(),
+    )
 
-retriever = PathwayRetriever(host=PATHWAY_HOST, port=PATHWAY_PORT)
-retriever.client = VectorStoreClient(
-    host=PATHWAY_HOST, port=PATHWAY_PORT, additional_headers=get_additional_headers()
-)
 
 pathway_explaination = "Pathway is a high-throughput, low-latency data processing framework that handles live data & streaming for you."
 DEFAULT_MESSAGES = [
@@ -54,6 +70,48 @@ DEFAULT_MESSAGES = [
 ]
 
 
+def _create_retriever():
+    """Create the Pathway retriever; the retriever module is only imported when the chat engine is built."""
+    from llama_index.retrievers import PathwayRetriever
+
+    retriever = PathwayRetriever(host=PATHWAY_HOST, port=PATHWAY_PORT)
+    retriever.client = get_vector_client()
+    return _cache_retrieval(retriever)
+
+
+@lru_cache(maxsize=1)
+def _get_retriever():
+    """Get the shared (cached) Pathway retriever, creating it on first call."""
+    return _create_retriever()
+
+
+def _cache_retrieval(retriever):
+    """Wrap retriever.retrieve with a TTL cache keyed on the normalized query string."""
+    if RETRIEVER_CACHE_SIZE <= 0 or RETRIEVER_CACHE_TTL <= 0:
+        return retriever
+
+    from cachetools import TTLCache
+
+    # The index is live, so entries expire rather than being kept for the whole session
+    cache = TTLCache(maxsize=RETRIEVER_CACHE_SIZE, ttl=RETRIEVER_CACHE_TTL)
+    lock = threading.Lock()
+    retrieve = retriever.retrieve
+
+    def cached_retrieve(query):
+        query_str = query if isinstance(query, str) else query.query_str
+        key = " ".join(query_str.split()).lower()
+        with lock:
+            nodes = cache.get(key)
+        if nodes is None:
+            nodes = tuple(retrieve(query))
+            with lock:
+                cache[key] = nodes
+        return list(nodes)
+
+    retriever.retrieve = cached_retrieve
+    return retriever
+
+
 def _initialize_chat_engine():
     """Initialize chat engine lazily to avoid circular imports and default OpenAI instantiation."""
     from llama_index.chat_engine.condense_plus_context import CondensePlusContextChatEngine
@@ -70,7 +128,7 @@ def _initialize_chat_engine():
     )
     
     chat_engine = CondensePlusContextChatEngine.from_defaults(
-        retriever=retriever,
+        retriever=_get_retriever(),
         service_context=service_context,
         system_prompt="""You are RAG AI that answers users questions based on provided sources.
     IF QUESTION IS NOT RELATED TO ANY OF THE CONTEXT DOCUMENTS, SAY IT'S NOT POSSIBLE TO ANSWER USING PHRASE `The looked-up documents do not provde information about...`""",
@@ -88,5 +146,6 @@ def get_chat_engine():
     """Get or initialize the chat engine."""
     global _chat_engine
     if _chat_engine is None:
+        init_tracing()
         _chat_engine = _initialize_chat_engine()
     return _chat_engine
@@ -1,41 +1,272 @@
-import nltk
+import importlib.util
+import logging
+import os
+from functools import lru_cache
+
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Checked without importing: numba itself is loaded and the scan compiled on first use
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+
+def _chunk_boundaries(lens, min_size):
+    # End index (exclusive) of every chunk whose ' '-joined length reaches min_size
+    out = np.empty(len(lens), np.int64)
+    n = 0
+    acc = 0
+    start = 0
+    for i in range(len(lens)):
+        acc += lens[i] + (1 if i > start else 0)
+        if acc >= min_size:
+            out[n] = i + 1
+            n += 1
+            start = i + 1
+            acc = 0
+    return out[:n]
+
+
+def _chunk_boundaries_np(lens, min_size):
+    # Vectorized equivalent of _chunk_boundaries: one searchsorted per chunk instead of a loop per sentence.
+    # cum[i] is the ' '-joined length of sentences[:i + 1] plus one trailing separator, so a chunk
+    # starting after cum value `base` is long enough at the first i where cum[i] >= base + min_size + 1
+    cum = np.cumsum(lens + 1)
+    # Every non-empty chunk already satisfies a non-positive minimum
+    min_size = max(min_size, 0)
+    bounds = []
+    base = 0
+    while True:
+        i = int(np.searchsorted(cum, base + min_size + 1, side='left'))
+        if i >= len(cum):
+            return bounds
+        bounds.append(i + 1)
+        base = cum[i]
+
+
+def _adjacent_similarities(matrix, to_numpy=np.asarray):
+    # Cosine of each row with the next for a row-normalized sparse matrix: one elementwise (Hadamard)
+    # product of the shifted CSR slices and a row sum, with nothing dense of size N x N
+    return to_numpy(matrix[:-1].multiply(matrix[1:]).sum(axis=1)).ravel()
+
+
+@lru_cache(maxsize=None)
+def _boundary_scan():
+    # Compiled _chunk_boundaries when numba is installed, otherwise the NumPy fallback.
+    # cache=True persists the compiled scan in __pycache__, so only the first process pays for the JIT
+    if NUMBA_AVAILABLE:
+        try:
+            from numba import njit
+        except ImportError:
+            return _chunk_boundaries_np
+        return njit(cache=True, fastmath=True)(_chunk_boundaries)
+    return _chunk_boundaries_np
+
+
+# Optionally import numba and compile (or load from cache) at import rather than on the first chunk_text call
+if NUMBA_AVAILABLE and os.environ.get("SEMANTIC_CHUNKING_PRECOMPILE", "").lower() in ("1", "true", "yes"):
+    _boundary_scan()(np.zeros(1, np.int64), 100)
 
 class SemanticChunking:
-    def __init__(self, min_chunk_size=100):
+    def __init__(self, min_chunk_size=100, use_gpu=False, similarity_threshold=0.5, adaptive=False, adaptive_quantile=0.4):
+        # sklearn and nltk are imported where used so importing this module stays cheap
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+        from sklearn.pipeline import make_pipeline
+
         self.min_chunk_size = min_chunk_size
-        self.vectorizer = TfidfVectorizer()
+        # A chunk is kept when its similarity to the previous chunk falls below the threshold.
+        # With adaptive=True the threshold is derived per document from the similarity distribution.
+        self.similarity_threshold = similarity_threshold
+        self.adaptive = adaptive
+        self.adaptive_quantile = adaptive_quantile
+        # Hashing needs no vocabulary to learn; the transformer adds IDF weighting and L2 rows.
+        # float32 is ample for a 0.5 cosine threshold and halves the sparse data the similarity pass reads
+        self.vectorizer = make_pipeline(
+            HashingVectorizer(n_features=2**18, alternate_sign=False, norm=None, dtype=np.float32),
+            TfidfTransformer(norm='l2'),
+        )
+        # Set by fit(): IDF weights learned from a corpus sample are reused instead of refit per document
+        self._fitted = False
+        self._sent_tok = None
+
+        # Optional RAPIDS path for documents with thousands of chunks; CPU is used if it is missing
+        self.use_gpu = use_gpu
+        if use_gpu:
+            try:
+                import cudf  # noqa: F401
+                import cupy  # noqa: F401
+                from cuml.feature_extraction.text import TfidfVectorizer  # noqa: F401
+            except ImportError:
+                logging.warning("cuML/cuPy not installed. Falling back to CPU similarity.")
+                self.use_gpu = False
+
+    def fit(self, corpus_sample):
+        """
+        Learn IDF weights once from a sample of documents (or chunks). Later
+        calls then only transform each document instead of refitting.
+        """
+        self.vectorizer.fit(corpus_sample)
+        self._fitted = True
+        return self
+
+    def _vectorize(self, chunks):
+        if self._fitted:
+            return self.vectorizer.transform(chunks)
+        return self.vectorizer.fit_transform(chunks)
+
+    def _sentence_tokenizer(self):
+        # Load the punkt model once per instance instead of resolving it on every sent_tokenize call
+        if self._sent_tok is None:
+            try:
+                from nltk.tokenize import PunktTokenizer  # nltk >= 3.9 (punkt_tab)
+                self._sent_tok = PunktTokenizer()
+            except ImportError:
+                import nltk.data
+                self._sent_tok = nltk.data.load('tokenizers/punkt/english.pickle')
+        return self._sent_tok
 
     def chunk_text(self, text):
-        sentences = nltk.sent_tokenize(text)
-        chunks = []
-        current_chunk = []
+        sentences = self._sentence_tokenizer().tokenize(text)
 
-        for sentence in sentences:
-            current_chunk.append(sentence)
-            if len(' '.join(current_chunk)) >= self.min_chunk_size:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = []
+        lens = np.fromiter((len(s) for s in sentences), dtype=np.int64, count=len(sentences))
+        # Compiled integer scan over sentence lengths, or its vectorized NumPy equivalent
+        bounds = _boundary_scan()(lens, self.min_chunk_size)
 
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
+        # Each chunk is a slice of the sentence list, joined exactly once
+        chunks = []
+        start = 0
+        for end in bounds:
+            chunks.append(' '.join(sentences[start:end]))
+            start = end
+        if start < len(sentences):
+            chunks.append(' '.join(sentences[start:]))
 
         return chunks
 
     def get_semantic_chunks(self, text):
+        """
+        Keep the first chunk, then every chunk whose cosine similarity to its
+        immediate predecessor is below the similarity threshold (i.e. where the
+        topic shifts).
+        """
         chunks = self.chunk_text(text)
-        tfidf_matrix = self.vectorizer.fit_transform(chunks)
-        cosine_sim = cosine_similarity(tfidf_matrix)
+        if len(chunks) <= 1:
+            # Nothing to compare; skip vectorizing entirely
+            return chunks
+        if self.use_gpu:
+            pair_sim = self._gpu_pair_similarities(chunks)
+        else:
+            # The transformer already emits unit-length rows, so no extra normalize pass is needed
+            pair_sim = _adjacent_similarities(self._vectorize(chunks))
 
-        semantic_chunks = []
-        for i, chunk in enumerate(chunks):
-            if i == 0 or np.max(cosine_sim[i-1]) < 0.5:
-                semantic_chunks.append(chunk)
+        # pair_sim[i-1] is sim(chunks[i-1], chunks[i]); the diagonal self-similarity never enters the test
+        threshold = self._threshold(pair_sim)
+        semantic_chunks = [chunks[0]] + [chunks[i] for i in range(1, len(chunks)) if pair_sim[i-1] < threshold]
 
         return semantic_chunks
 
+    def get_novel_chunks(self, text, block_size=1024):
+        """
+        Keep each chunk whose similarity to every earlier chunk (not just the
+        immediately preceding one) is below similarity_threshold.
+
+        Similarities are exact cosines, computed in block_size x block_size
+        tiles and folded into a running max, so peak memory is one tile. Time
+        is still O(N^2) in the number of chunks: exactness was preferred over
+        an approximate nearest-neighbour search.
+        """
+        chunks = self.chunk_text(text)
+        if len(chunks) < 2:
+            return chunks
+
+        tfidf_matrix = self._vectorize(chunks)
+        n = len(chunks)
+        # TF-IDF weights are non-negative, so 0 is the floor for every chunk's best prior match
+        max_prior = np.zeros(n, dtype=np.float32)
+        for r0 in range(1, n, block_size):
+            r1 = min(r0 + block_size, n)
+            rows = tfidf_matrix[r0:r1]
+            # Only predecessors: column tiles stop at the last row of this block
+            for c0 in range(0, r1, block_size):
+                c1 = min(c0 + block_size, r1)
+                # Shared stopwords make tiles nearly dense, so a dense tile is the cheaper layout
+                tile = (rows @ tfidf_matrix[c0:c1].T).toarray()
+                if c1 > r0:
+                    # Tile overlaps the diagonal: mask each row's own and later chunks
+                    tile[np.arange(c0, c1)[None, :] >= np.arange(r0, r1)[:, None]] = 0
+                np.maximum(max_prior[r0:r1], tile.max(axis=1), out=max_prior[r0:r1])
+
+        return [chunks[0]] + [chunks[i] for i in range(1, n) if max_prior[i] < self.similarity_threshold]
+
+    def _threshold(self, pair_sim):
+        if self.adaptive and len(pair_sim):
+            return float(np.quantile(pair_sim, self.adaptive_quantile))
+        return self.similarity_threshold
+
+    def iter_semantic_chunks(self, text, window_size=1024):
+        """
+        Lazily yield the same chunks as get_semantic_chunks, vectorizing at most
+        window_size + 1 chunks at a time so memory stays bounded on long texts.
+        """
+        chunks = self.chunk_text(text)
+        if not chunks:
+            return
+
+        pairs = self._windowed_pair_similarities(chunks, window_size)
+        if self.adaptive:
+            # The quantile needs every similarity, but that is only N - 1 floats
+            pair_sim = np.fromiter(pairs, dtype=np.float64, count=len(chunks) - 1)
+            threshold = self._threshold(pair_sim)
+            pairs = iter(pair_sim)
+        else:
+            threshold = self.similarity_threshold
+
+        yield chunks[0]
+        for i, sim in enumerate(pairs, start=1):
+            if sim < threshold:
+                yield chunks[i]
+
+    def _windowed_pair_similarities(self, chunks, window_size):
+        # Yields sim(chunks[i-1], chunks[i]) for i = 1..N-1, one window of rows at a time
+        from sklearn.preprocessing import normalize
+
+        hashing = self.vectorizer.steps[0][1]
+        tfidf = self.vectorizer.steps[-1][1]
+
+        if self._fitted:
+            idf = tfidf.idf_.astype(hashing.dtype)
+        else:
+            # First pass only counts document frequencies, so the IDF weights are the
+            # same as fitting the transformer on the whole document
+            smooth = int(tfidf.smooth_idf)
+            df = np.zeros(hashing.n_features, dtype=np.int64)
+            for start in range(0, len(chunks), window_size):
+                df += np.bincount(hashing.transform(chunks[start:start + window_size]).indices, minlength=hashing.n_features)
+            idf = (np.log((len(chunks) + smooth) / (df + smooth)) + 1).astype(hashing.dtype)
+
+        for start in range(0, len(chunks) - 1, window_size):
+            # Overlap one chunk with the previous window to cover the pair across the boundary
+            counts = hashing.transform(chunks[start:start + window_size + 1])
+            counts.data *= idf[counts.indices]
+            window = normalize(counts, norm='l2', copy=False)
+            yield from _adjacent_similarities(window)
+
+    def _gpu_pair_similarities(self, chunks):
+        # Same consecutive-pair cosine as the CPU path, computed on the GPU with cuML TF-IDF
+        import cudf
+        import cupy as cp
+        from cuml.feature_extraction.text import TfidfVectorizer
+
+        tfidf_matrix = TfidfVectorizer(norm='l2').fit_transform(cudf.Series(chunks))
+        return _adjacent_similarities(tfidf_matrix, cp.asnumpy)
+
+    def similarity_matrix(self, chunks):
+        """
+        Full N x N cosine similarity matrix between chunks, for callers that need
+        every pair (e.g. clustering). get_semantic_chunks only needs adjacent pairs.
+        """
+        # Rows come out of the transformer L2-normalized, so a single sparse product gives all cosines
+        tfidf_matrix = self._vectorize(chunks)
+        return (tfidf_matrix @ tfidf_matrix.T).toarray()
+
 # Example usage:
 # text = "Your document text goes here."  # Replace with actual text
 # chunker = SemanticChunking()